@@ -0,0 +1,43 @@
+"""
+Token-level diff masking for vulnerability-fix pairs.
+
+Concrete loaders call compute_diff_mask() once per pair from their
+apply_diff_masking() implementation, after tokenizing both sides.
+
+Usage:
+    from data.diff_masking import compute_diff_mask
+"""
+
+import numpy as np
+from rapidfuzz.distance import Levenshtein
+
+
+def compute_diff_mask(vuln_ids: np.ndarray, fix_ids: np.ndarray) -> np.ndarray:
+    """
+    Mark which tokens of the vulnerable code were changed by the fix.
+    
+    Args:
+        vuln_ids: Token IDs of the vulnerable code
+        fix_ids: Token IDs of the fixed code
+        
+    Returns:
+        uint8 array of len(vuln_ids) (1 = token replaced or deleted by fix)
+        
+    Example:
+        >>> vuln_ids = np.array(tokenizer(vulnerable)["input_ids"])
+        >>> fix_ids = np.array(tokenizer(fixed)["input_ids"])
+        >>> diff_mask = compute_diff_mask(vuln_ids, fix_ids).tolist()
+        
+    Note: Uses rapidfuzz's C++ Levenshtein edit-ops. There is deliberately
+          no difflib fallback: its opcodes give different masks, which would
+          make training labels depend on the environment. Convert with
+          .tolist() only at the List[int] API boundary.
+    """
+    mask = np.zeros(len(vuln_ids), dtype=np.uint8)
+    vuln = np.asarray(vuln_ids).tolist()
+    fix = np.asarray(fix_ids).tolist()
+    
+    for op in Levenshtein.editops(vuln, fix):
+        if op.tag in ("replace", "delete"):
+            mask[op.src_pos] = 1
+    return mask
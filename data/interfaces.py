@@ -7,8 +7,11 @@ Dataset loader interface.
 DO NOT modify interface signatures without team coordination!
 """
 
+import queue
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Iterator
+from typing import List, Iterator, Optional, Callable, Any
+import numpy as np
 from data.schemas import VulnerabilityPair, DatasetConfig
 
 
@@ -57,6 +60,40 @@ class BaseDatasetLoader(ABC):
         """
         pass
     
+    def get_iterator_batched(
+        self,
+        config: DatasetConfig,
+        batch_size: int,
+        fetch_factor: int = 8,
+        seed: Optional[int] = None
+    ) -> Iterator[List[VulnerabilityPair]]:
+        """
+        Return iterator that reads several batches per underlying fetch.
+        
+        Pulls batch_size * fetch_factor pairs per get_iterator() call (one
+        large shard/range read instead of many small ones), shuffles them in
+        memory, and yields fetch_factor minibatches of batch_size.
+        
+        Args:
+            config: Dataset configuration
+            batch_size: Number of pairs per yielded batch
+            fetch_factor: Number of batches read per fetch
+            seed: Seed for the in-memory shuffle (None = random)
+            
+        Yields:
+            Batches of VulnerabilityPair objects (the last may be smaller)
+            
+        Raises:
+            ValueError: If batch_size or fetch_factor is less than 1
+        """
+        if batch_size < 1 or fetch_factor < 1:
+            raise ValueError(f"batch_size and fetch_factor must be >= 1, got {batch_size} and {fetch_factor}")
+        rng = np.random.default_rng(seed)
+        for block in self.get_iterator(config, batch_size * fetch_factor):
+            order = rng.permutation(len(block))
+            for start in range(0, len(block), batch_size):
+                yield [block[i] for i in order[start:start + batch_size]]
+    
     @abstractmethod
     def apply_diff_masking(self, vulnerable: str, fixed: str) -> List[int]:
         """
@@ -70,9 +107,109 @@ class BaseDatasetLoader(ABC):
             List of 0s and 1s (1 = token changed)
             
         Note: This is critical for SVEN's training - must accurately identify
-              which tokens were modified for security fix.
+              which tokens were modified for security fix. Use
+              data.diff_masking.compute_diff_mask() on the token IDs.
+        """
+        pass
+
+
+class PrefetchingIteratorMixin(ABC):
+    """
+    Default get_iterator() that loads batches on a background thread.
+    
+    Batches are read ahead into a bounded queue, so dataset I/O overlaps
+    with GPU compute in the training loop instead of blocking between steps.
+    
+    Kush uses:
+    - class BigVulDataset(PrefetchingIteratorMixin, BaseDatasetLoader)
+    - Implement _iter_raw() instead of get_iterator()
+    
+    Note: Only one thread runs Python at a time, so per-batch transforms
+          should do their heavy work in numpy/torch ops (which release the
+          GIL) to actually overlap with training.
+    """
+    
+    _END = object()
+    
+    @abstractmethod
+    def _iter_raw(self, config: DatasetConfig, batch_size: int) -> Iterator[List[VulnerabilityPair]]:
+        """
+        Synchronous batch generator wrapped by get_iterator().
+        
+        Args:
+            config: Dataset configuration
+            batch_size: Number of pairs per batch
+            
+        Yields:
+            Batches of VulnerabilityPair objects
         """
         pass
+    
+    def get_iterator(
+        self,
+        config: DatasetConfig,
+        batch_size: int,
+        prefetch: int = 4,
+        transform: Optional[Callable[[List[VulnerabilityPair]], Any]] = None
+    ) -> Iterator[List[VulnerabilityPair]]:
+        """
+        Return iterator for batched loading with background prefetching.
+        
+        Args:
+            config: Dataset configuration
+            batch_size: Number of pairs per batch
+            prefetch: Max number of batches loaded ahead of the consumer
+            transform: Optional function applied to each batch on the
+                       background thread (tokenize, collate, pin memory)
+            
+        Yields:
+            Batches of VulnerabilityPair objects (or transform's output)
+            
+        Errors raised by _iter_raw() are re-raised in the consuming thread.
+        
+        Example:
+            >>> to_tensors = lambda pairs: VulnerabilityPairBatch.from_list(
+            ...     pairs, tokenizer).to_tensors(pin_memory=True)
+            >>> for batch in loader.get_iterator(config, 8, transform=to_tensors):
+            ...     losses = model.compute_loss(
+            ...         batch["vulnerable_input_ids"], batch["vulnerable_labels"], batch["diff_mask"])
+        """
+        batches = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+        
+        def put(item) -> bool:
+            # Give up if the consumer stopped iterating early
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            try:
+                for batch in self._iter_raw(config, batch_size):
+                    if transform is not None:
+                        batch = transform(batch)
+                    if not put(batch):
+                        return
+            except BaseException as e:
+                put(e)
+            put(self._END)
+        
+        worker = threading.Thread(target=produce, daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = batches.get()
+                if item is self._END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
 
 
 class DatasetRegistry:
@@ -81,17 +218,28 @@ class DatasetRegistry:
     
     Kush registers datasets here.
     Rohit looks up datasets by name.
+    
+    Loaders are created once per name and reused by later lookups.
     """
     _loaders = {}
+    _cache = {}
     
     @classmethod
     def register(cls, name: str, loader_class: type):
         """Register a dataset loader"""
         cls._loaders[name] = loader_class
+        cls._cache.pop(name, None)
     
     @classmethod
     def get_loader(cls, name: str) -> BaseDatasetLoader:
-        """Get dataset loader by name"""
+        """Get (shared) dataset loader instance by name"""
         if name not in cls._loaders:
             raise ValueError(f"Unknown dataset: {name}. Available: {list(cls._loaders.keys())}")
-        return cls._loaders[name]()
+        if name not in cls._cache:
+            cls._cache[name] = cls._loaders[name]()
+        return cls._cache[name]
+    
+    @classmethod
+    def clear_cache(cls):
+        """Drop cached loader instances (e.g. between tests)"""
+        cls._cache.clear()
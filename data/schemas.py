@@ -11,6 +11,7 @@ Usage:
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 from enum import Enum
+import numpy as np
 
 
 class Language(Enum):
@@ -20,6 +21,13 @@ class Language(Enum):
     CPP = "cpp"
 
 
+# Stable integer codes for languages (used by VulnerabilityPairBatch.lang)
+LANGUAGE_CODES = [language.value for language in Language]
+
+# Label value ignored by the LM loss (matches torch cross_entropy's ignore_index)
+IGNORE_INDEX = -100
+
+
 class CWE(Enum):
     """Common Weakness Enumeration types we're targeting"""
     SQL_INJECTION = "CWE-089"
@@ -58,6 +66,118 @@ class VulnerabilityPair:
         assert self.language in ["python", "java", "cpp"], f"Invalid language: {self.language}"
 
 
+@dataclass
+class VulnerabilityPairBatch:
+    """
+    Struct-of-arrays batch of vulnerability-fix pairs.
+    
+    Same data as a List[VulnerabilityPair], but tokenized and stored as
+    contiguous padded numpy arrays, so the training loop can hand a whole
+    batch to torch without per-sample attribute access.
+    
+    Produced by:
+    - VulnerabilityPairBatch.from_list() on loader output
+    
+    Consumed by:
+    - Rohit's training loop (training/train.py)
+    """
+    vulnerable_ids: np.ndarray    # [batch, seq_len] int32, padded
+    fixed_ids: np.ndarray         # [batch, seq_len] int32, padded
+    diff_mask: np.ndarray         # [batch, seq_len] uint8 (1=changed, 0=same/padding)
+    vulnerable_lengths: np.ndarray  # [batch] int32, unpadded length of vulnerable_ids
+    fixed_lengths: np.ndarray     # [batch] int32, unpadded length of fixed_ids
+    cwe_id: np.ndarray            # [batch] bytes "S10", e.g. b"CWE-089"
+    lang: np.ndarray              # [batch] uint8, index into LANGUAGE_CODES
+    
+    def __len__(self) -> int:
+        return len(self.cwe_id)
+    
+    @classmethod
+    def from_list(
+        cls,
+        pairs: List[VulnerabilityPair],
+        tokenizer: Any,
+        max_length: int = 512,
+        pad_token_id: int = 0
+    ) -> "VulnerabilityPairBatch":
+        """
+        Tokenize pairs and stack them into padded arrays.
+        
+        Args:
+            pairs: VulnerabilityPair objects (e.g. one loader batch)
+            tokenizer: Hugging Face tokenizer (callable returning input_ids)
+            max_length: Sequences are truncated to this many tokens
+            pad_token_id: Token ID used for padding
+            
+        Returns:
+            VulnerabilityPairBatch padded to the longest sequence in the batch
+            
+        Example:
+            >>> batch = VulnerabilityPairBatch.from_list(pairs, tokenizer)
+            >>> batch.vulnerable_ids.shape  # (len(pairs), seq_len)
+        """
+        vulnerable = tokenizer([p.vulnerable_code for p in pairs], truncation=True, max_length=max_length)["input_ids"]
+        fixed = tokenizer([p.fixed_code for p in pairs], truncation=True, max_length=max_length)["input_ids"]
+        seq_len = max([len(ids) for ids in vulnerable + fixed], default=0)
+        
+        batch = cls(
+            vulnerable_ids=np.full((len(pairs), seq_len), pad_token_id, dtype=np.int32),
+            fixed_ids=np.full((len(pairs), seq_len), pad_token_id, dtype=np.int32),
+            diff_mask=np.zeros((len(pairs), seq_len), dtype=np.uint8),
+            vulnerable_lengths=np.array([len(ids) for ids in vulnerable], dtype=np.int32),
+            fixed_lengths=np.array([len(ids) for ids in fixed], dtype=np.int32),
+            cwe_id=np.array([p.cwe_id for p in pairs], dtype="S10"),
+            lang=np.array([LANGUAGE_CODES.index(p.language) for p in pairs], dtype=np.uint8),
+        )
+        for i, pair in enumerate(pairs):
+            batch.vulnerable_ids[i, :len(vulnerable[i])] = vulnerable[i]
+            batch.fixed_ids[i, :len(fixed[i])] = fixed[i]
+            mask = pair.diff_mask[:len(vulnerable[i])]
+            batch.diff_mask[i, :len(mask)] = mask
+        return batch
+    
+    def to_tensors(self, pin_memory: bool = False) -> Dict[str, Any]:
+        """
+        Convert to torch tensors for compute_loss().
+        
+        The vulnerable and fixed sequences differ in length and edits, so
+        they are not aligned by position. Each side gets its own aligned
+        set: "<side>_input_ids", "<side>_labels" and "<side>_attention_mask"
+        for side in ("vulnerable", "fixed"). Labels equal the input IDs, with
+        IGNORE_INDEX (-100) wherever that side is padded, so cross-entropy
+        only scores real tokens. "diff_mask" is aligned with the vulnerable
+        side.
+        
+        Args:
+            pin_memory: Page-lock the tensors (ignored without CUDA) so the
+                        model can copy them with .to(device, non_blocking=True)
+            
+        Returns:
+            Dictionary of the seven tensors described above
+            
+        Example:
+            >>> t = batch.to_tensors()
+            >>> model.compute_loss(t["vulnerable_input_ids"], t["vulnerable_labels"], t["diff_mask"])
+        """
+        import torch  # Only the training side needs torch
+        
+        tensors = {"diff_mask": torch.from_numpy(self.diff_mask)}
+        positions = np.arange(self.vulnerable_ids.shape[1])
+        for side, ids, lengths in (
+            ("vulnerable", self.vulnerable_ids, self.vulnerable_lengths),
+            ("fixed", self.fixed_ids, self.fixed_lengths),
+        ):
+            attention_mask = positions[None, :] < lengths[:, None]
+            labels = ids.astype(np.int64)
+            labels[~attention_mask] = IGNORE_INDEX
+            tensors[f"{side}_input_ids"] = torch.from_numpy(ids).long()
+            tensors[f"{side}_labels"] = torch.from_numpy(labels)
+            tensors[f"{side}_attention_mask"] = torch.from_numpy(attention_mask.astype(np.int64))
+        if pin_memory and torch.cuda.is_available():
+            tensors = {name: tensor.pin_memory() for name, tensor in tensors.items()}
+        return tensors
+
+
 @dataclass
 class GeneratedCode:
     """
@@ -114,4 +234,4 @@ class ModelOutput:
 
 
 # Version tracking - increment when schema changes
-SCHEMA_VERSION = "1.0.0"
+SCHEMA_VERSION = "1.1.0"
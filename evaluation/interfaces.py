@@ -7,10 +7,20 @@ Evaluation interface for security and functionality testing.
 DO NOT modify interface signatures without team coordination!
 """
 
+import logging
+import multiprocessing
+import os
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import wait
 from typing import List, Dict, Optional
+import numpy as np
 from data.schemas import GeneratedCode
 
+logger = logging.getLogger(__name__)
+
 
 class BaseSecurityEvaluator(ABC):
     """
@@ -59,11 +69,92 @@ class BaseSecurityEvaluator(ABC):
             Security rate as percentage (0.0 to 100.0)
             
         Example:
-            >>> codes = [model.generate(prompt) for prompt in test_prompts]
+            >>> codes = model.generate_batch(test_prompts)
             >>> security_rate = evaluator.compute_security_rate(codes)
             >>> print(f"Security Rate: {security_rate}%")
         """
         pass
+    
+    def analyze_language_group(self, codes: List[str], language: str) -> List[List[str]]:
+        """
+        Analyze several snippets of the same language.
+        
+        Args:
+            codes: Source code snippets, all in one language
+            language: Programming language ("python", "java", "cpp")
+            
+        Returns:
+            List of CWE ID lists, one per snippet (same order as codes)
+            
+        Note: The default calls analyze_code() per snippet. CodeQL-based
+              evaluators should override this to pack the whole group into
+              a single database, which is much cheaper than one per snippet.
+        """
+        return [self.analyze_code(code, language) for code in codes]
+    
+    def analyze_batch(
+        self,
+        generated_codes: List[GeneratedCode],
+        max_workers: Optional[int] = None
+    ) -> List[Optional[List[str]]]:
+        """
+        Analyze a corpus, running each language group concurrently.
+        
+        Groups generated_codes by language and calls analyze_language_group()
+        for the groups in parallel. If a whole group fails, its snippets are
+        retried one at a time with analyze_code(). Also fills in
+        security_violations on each GeneratedCode that was analyzed.
+        
+        Args:
+            generated_codes: List of GeneratedCode objects to evaluate
+            max_workers: Max concurrent groups (defaults to one per language)
+            
+        Returns:
+            List of CWE ID lists, one per GeneratedCode (same order);
+            None for snippets that could not be analyzed at all
+            
+        Example:
+            >>> violations = [v for v in evaluator.analyze_batch(codes) if v is not None]
+            >>> security_rate = 100.0 * sum(not v for v in violations) / len(violations)
+        """
+        groups: Dict[str, List[int]] = {}
+        for i, generated in enumerate(generated_codes):
+            groups.setdefault(generated.language, []).append(i)
+        
+        results: List[Optional[List[str]]] = [None for _ in generated_codes]
+        if not groups:
+            return results
+        # Analysis runs in external tools (CodeQL subprocesses), so threads suffice
+        with ThreadPoolExecutor(max_workers=max_workers or len(groups)) as executor:
+            futures = {
+                language: executor.submit(
+                    self._analyze_group_with_fallback,
+                    [generated_codes[i].code for i in indices],
+                    language
+                )
+                for language, indices in groups.items()
+            }
+            for language, future in futures.items():
+                for i, cwe_list in zip(groups[language], future.result()):
+                    results[i] = cwe_list
+                    generated_codes[i].security_violations = cwe_list
+        return results
+    
+    def _analyze_group_with_fallback(self, codes: List[str], language: str) -> List[Optional[List[str]]]:
+        """Analyze a group, falling back to per-snippet analysis if it fails"""
+        try:
+            return self.analyze_language_group(codes, language)
+        except Exception as e:
+            logger.warning("Analysis of %d %s snippets failed (%s); retrying per file", len(codes), language, e)
+        
+        results: List[Optional[List[str]]] = []
+        for code in codes:
+            try:
+                results.append(self.analyze_code(code, language))
+            except Exception as e:
+                logger.warning("Analysis of a %s snippet failed: %s", language, e)
+                results.append(None)
+        return results
 
 
 class BaseFunctionalEvaluator(ABC):
@@ -97,7 +188,8 @@ class BaseFunctionalEvaluator(ABC):
             
         Example:
             >>> evaluator = HumanEvalRunner()
-            >>> codes = [model.generate(problem.prompt) for problem in humaneval_problems]
+            >>> outputs = model.generate_batch([problem.prompt for problem in humaneval_problems])
+            >>> codes = [output.code for output in outputs]
             >>> results = evaluator.run_humaneval(codes, k_values=[1, 10])
         """
         pass
@@ -113,8 +205,146 @@ class BaseFunctionalEvaluator(ABC):
             
         Returns:
             True if all test cases pass, False otherwise
+            
+        Note: Exec the generated function and its test assertions as one
+              combined source string, otherwise the asserts never run
+              against the generated definition.
         """
         pass
+    
+    def test_solutions_parallel(
+        self,
+        codes: List[str],
+        test_cases: List[List[Dict]],
+        timeout: float = 5.0,
+        max_workers: Optional[int] = None
+    ) -> List[bool]:
+        """
+        Run test_single_solution() for many solutions in parallel.
+        
+        Each solution runs in its own process (as in human-eval's
+        execution.py). The timeout starts when that process starts, and the
+        process is killed when it runs out, so hung solutions never hold up
+        or fail the solutions queued behind them.
+        
+        Args:
+            codes: Generated code solutions
+            test_cases: Test cases for each solution (same order as codes)
+            timeout: Seconds each solution may run before it is killed
+            max_workers: Max concurrent processes (defaults to os.cpu_count())
+            
+        Returns:
+            List of pass/fail results, in the same order as codes
+            
+        Note: On platforms that spawn instead of fork, the evaluator must
+              be picklable. Solutions that time out, raise or crash count
+              as failures.
+        """
+        if len(codes) != len(test_cases):
+            raise ValueError(f"Got {len(codes)} solutions but {len(test_cases)} test case lists")
+        max_workers = max_workers or os.cpu_count() or 1
+        results = [False] * len(codes)
+        pending = deque(range(len(codes)))
+        running = {}  # index -> (process, connection, deadline)
+        
+        try:
+            while pending or running:
+                while pending and len(running) < max_workers:
+                    i = pending.popleft()
+                    receiver, sender = multiprocessing.Pipe(duplex=False)
+                    # Not a daemon: solutions may start their own child process
+                    # (e.g. human-eval's check_correctness). Every worker is
+                    # killed and joined below, so none can outlive this call.
+                    process = multiprocessing.Process(
+                        target=_run_solution,
+                        args=(self, codes[i], test_cases[i], sender)
+                    )
+                    process.start()
+                    sender.close()
+                    running[i] = (process, receiver, time.monotonic() + timeout)
+                
+                next_deadline = min(deadline for _, _, deadline in running.values())
+                wait(
+                    [receiver for _, receiver, _ in running.values()],
+                    timeout=max(0.0, next_deadline - time.monotonic())
+                )
+                
+                now = time.monotonic()
+                for i, (process, receiver, deadline) in list(running.items()):
+                    if receiver.poll():
+                        try:
+                            results[i] = receiver.recv()
+                        except EOFError:
+                            # Process died without reporting (e.g. os._exit, segfault)
+                            results[i] = False
+                    elif now < deadline:
+                        continue
+                    process.kill()
+                    process.join()
+                    receiver.close()
+                    del running[i]
+        finally:
+            for process, receiver, _ in running.values():
+                process.kill()
+                process.join()
+                receiver.close()
+        return results
+    
+    @staticmethod
+    def estimate_pass_at_k(n: int, c: int, k: int) -> float:
+        """
+        Unbiased Pass@k estimate for one problem: 1 - C(n-c, k) / C(n, k).
+        
+        Args:
+            n: Number of samples generated
+            c: Number of correct samples
+            k: k in Pass@k
+            
+        Returns:
+            Probability that at least one of k samples passes (0.0 to 1.0)
+        """
+        if n - c < k:
+            return 1.0
+        # Product form avoids overflowing the binomial coefficients
+        return float(1.0 - np.prod(1.0 - k / np.arange(n - c + 1, n + 1)))
+    
+    def compute_pass_at_k(
+        self,
+        results: List[List[bool]],
+        k_values: List[int] = [1, 10, 100]
+    ) -> Dict[str, float]:
+        """
+        Average Pass@k over problems from per-sample pass/fail results.
+        
+        Args:
+            results: For each problem, pass/fail of each generated sample
+            k_values: Values of k for Pass@k metric
+            
+        Returns:
+            Dictionary like {"pass@1": 0.65, "pass@10": 0.82}
+            (k values larger than the number of samples are skipped)
+        """
+        pass_at_k = {}
+        for k in k_values:
+            if not results or any(len(samples) < k for samples in results):
+                continue
+            estimates = [
+                self.estimate_pass_at_k(len(samples), sum(samples), k)
+                for samples in results
+            ]
+            pass_at_k[f"pass@{k}"] = float(np.mean(estimates))
+        return pass_at_k
+
+
+def _run_solution(evaluator: BaseFunctionalEvaluator, code: str, test_cases: List[Dict], conn) -> None:
+    """Worker process body for BaseFunctionalEvaluator.test_solutions_parallel()"""
+    try:
+        passed = bool(evaluator.test_single_solution(code, test_cases))
+    except BaseException:
+        logger.debug("test_single_solution raised", exc_info=True)
+        passed = False
+    conn.send(passed)
+    conn.close()
 
 
 class EvaluationMetrics:
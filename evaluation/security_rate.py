@@ -0,0 +1,288 @@
+"""
+CodeQL-based security evaluation.
+
+Usage:
+    from evaluation.security_rate import CodeQLEvaluator
+
+    evaluator = CodeQLEvaluator()
+    security_rate = evaluator.compute_security_rate(generated_codes)
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import List, Dict, Optional
+from data.schemas import GeneratedCode
+from evaluation.interfaces import BaseSecurityEvaluator
+
+
+# File extension CodeQL uses to pick up each language's sources
+LANGUAGE_EXTENSIONS = {
+    "python": ".py",
+    "java": ".java",
+    "cpp": ".cpp",
+}
+
+# Matches CodeQL rule tags like "external/cwe/cwe-089"
+CWE_TAG_PATTERN = re.compile(r"^external/cwe/cwe-(\d+)$")
+
+
+class CodeQLEvaluator(BaseSecurityEvaluator):
+    """
+    Security evaluator that runs the CodeQL CLI on generated code.
+
+    Each language group is written to one source directory and analyzed
+    as a single CodeQL database, so database creation is paid once per
+    language instead of once per snippet.
+
+    Results are cached per snippet under cache_dir, keyed by a hash of the
+    CodeQL version, language, queries and source. Only snippets without a
+    cached result are extracted into the (temporary) database, so unchanged
+    samples across epochs skip CodeQL entirely. The cache keeps one small
+    JSON file per snippet and evicts the least recently used beyond
+    max_cache_entries.
+    """
+
+    def __init__(
+        self,
+        codeql_path: str = "codeql",
+        queries: Optional[Dict[str, str]] = None,
+        timeout: int = 60,
+        group_timeout: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        cache_dir: str = ".codeql_cache",
+        max_cache_entries: int = 100_000,
+        threads: int = 0,
+        ram: Optional[int] = None
+    ):
+        """
+        Args:
+            codeql_path: Path to codeql executable
+            queries: Query suite per language (defaults to codeql/<lang>-queries)
+            timeout: Seconds allowed per snippet (timeout_per_analysis)
+            group_timeout: Seconds allowed per CodeQL command on a group
+                           (defaults to timeout * number of snippets)
+            max_workers: Max languages analyzed concurrently
+            cache_dir: Directory for cached per-snippet results
+            max_cache_entries: Max cached snippet results kept on disk
+            threads: CodeQL --threads (0 = one per core)
+            ram: CodeQL --ram in MB (None = CodeQL default)
+        """
+        self.codeql_path = codeql_path
+        self.queries = queries or {}
+        self.timeout = timeout
+        self.group_timeout = group_timeout
+        self.max_workers = max_workers
+        self.cache_dir = Path(cache_dir)
+        self.max_cache_entries = max_cache_entries
+        self.threads = threads
+        self.ram = ram
+        self._result_cache: Dict[str, List[str]] = {}
+        self._codeql_version: Optional[str] = None
+        # Files on disk, counted once on first store, then tracked
+        self._cache_entries: Optional[int] = None
+        self._cache_lock = threading.Lock()
+
+    def analyze_code(self, code: str, language: str) -> List[str]:
+        """Analyze a single snippet (see BaseSecurityEvaluator)"""
+        return self.analyze_language_group([code], language)[0]
+
+    def analyze_language_group(self, codes: List[str], language: str) -> List[List[str]]:
+        """Analyze uncached snippets of one language in a single CodeQL database"""
+        if language not in LANGUAGE_EXTENSIONS:
+            raise ValueError(f"Unsupported language: {language}. Available: {list(LANGUAGE_EXTENSIONS.keys())}")
+        if not codes:
+            return []
+
+        queries = self.queries.get(language, f"codeql/{language}-queries")
+        version = self._get_codeql_version()
+        keys = [self._cache_key(version, language, queries, code) for code in codes]
+        missing = {key: code for key, code in zip(keys, codes) if self._load_cached(key) is None}
+
+        if missing:
+            extension = LANGUAGE_EXTENSIONS[language]
+            with tempfile.TemporaryDirectory(prefix="codeql_") as tmp:
+                tmp_dir = Path(tmp)
+                src_dir = tmp_dir / "src"
+                src_dir.mkdir()
+                for key, code in missing.items():
+                    (src_dir / f"snippet_{key}{extension}").write_text(code, encoding="utf-8")
+
+                timeout = self._timeout_for(len(missing))
+                self._create_database(tmp_dir / "db", src_dir, language, timeout)
+                sarif_path = tmp_dir / "results.sarif"
+                self._analyze_database(tmp_dir / "db", queries, sarif_path, timeout)
+                with open(sarif_path, encoding="utf-8") as f:
+                    findings = parse_sarif_cwes(json.load(f))
+
+            for key in missing:
+                self._store_cached(key, sorted(findings.get(f"snippet_{key}{extension}", set())))
+
+        return [self._result_cache[key] for key in keys]
+
+    def compute_security_rate(self, generated_codes: List[GeneratedCode]) -> float:
+        """
+        Compute Security Rate (see BaseSecurityEvaluator).
+
+        Snippets CodeQL could not analyze are left out of the rate.
+        """
+        if not generated_codes:
+            return 0.0
+        violations = [
+            cwe_list
+            for cwe_list in self.analyze_batch(generated_codes, max_workers=self.max_workers)
+            if cwe_list is not None
+        ]
+        if not violations:
+            raise RuntimeError(f"CodeQL could not analyze any of the {len(generated_codes)} snippets")
+        secure = sum(1 for cwe_list in violations if not cwe_list)
+        return 100.0 * secure / len(violations)
+
+    def _timeout_for(self, num_snippets: int) -> int:
+        """Timeout for one CodeQL command over num_snippets snippets"""
+        if self.group_timeout is not None:
+            return self.group_timeout
+        return self.timeout * max(1, num_snippets)
+
+    def _get_codeql_version(self) -> str:
+        """CodeQL CLI version, so upgrades don't serve stale cached results"""
+        if self._codeql_version is None:
+            self._codeql_version = self._run(["version", "--format=terse"], self.timeout).strip()
+        return self._codeql_version
+
+    @staticmethod
+    def _cache_key(version: str, language: str, queries: str, code: str) -> str:
+        """Hash everything that determines a snippet's analysis result"""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (version, language, queries, code):
+            data = part.encode("utf-8")
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def _load_cached(self, key: str) -> Optional[List[str]]:
+        """Return the cached CWE list for a snippet, or None on a miss"""
+        if key in self._result_cache:
+            return self._result_cache[key]
+        path = self.cache_dir / f"{key}.json"
+        try:
+            with open(path, encoding="utf-8") as f:
+                cwe_list = json.load(f)
+            os.utime(path)  # Mark as recently used for LRU eviction
+        except (OSError, ValueError):
+            return None
+        self._result_cache[key] = cwe_list
+        return cwe_list
+
+    def _store_cached(self, key: str, cwe_list: List[str]) -> None:
+        """Cache a snippet's CWE list in memory and on disk"""
+        self._result_cache[key] = cwe_list
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{key}.json"
+        # Write then rename so a partial file is never read back
+        partial_path = self.cache_dir / f"{key}.partial"
+        partial_path.write_text(json.dumps(cwe_list), encoding="utf-8")
+        with self._cache_lock:
+            is_new = not path.exists()
+            partial_path.replace(path)
+            if self._cache_entries is None:
+                self._cache_entries = sum(1 for _ in self.cache_dir.glob("*.json"))
+            elif is_new:
+                self._cache_entries += 1
+            if self._cache_entries > self.max_cache_entries:
+                self._prune_cache()
+
+    def _prune_cache(self) -> None:
+        """
+        Evict least recently used results down to 90% of max_cache_entries.
+
+        Pruning below the cap means the directory is only scanned again
+        after many more new entries, not on every store. Call with
+        _cache_lock held.
+        """
+        keep = int(self.max_cache_entries * 0.9)
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - keep)]:
+            path.unlink(missing_ok=True)
+        self._cache_entries = min(len(entries), keep)
+
+    def _resource_flags(self) -> List[str]:
+        """--threads/--ram flags shared by create and analyze"""
+        flags = [f"--threads={self.threads}"]
+        if self.ram is not None:
+            flags.append(f"--ram={self.ram}")
+        return flags
+
+    def _run(self, args: List[str], timeout: int) -> str:
+        """Run a codeql subcommand and return its stdout, raising with its stderr on failure"""
+        result = subprocess.run(
+            [self.codeql_path] + args,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"codeql {args[0]} {args[1]} failed: {result.stderr.strip()}")
+        return result.stdout
+
+    def _create_database(self, db_dir: Path, src_dir: Path, language: str, timeout: int) -> None:
+        """Extract sources into a CodeQL database (no build step)"""
+        self._run([
+            "database", "create", str(db_dir),
+            f"--language={language}",
+            f"--source-root={src_dir}",
+            "--build-mode=none",
+            "--overwrite",
+        ] + self._resource_flags(), timeout)
+
+    def _analyze_database(self, db_dir: Path, queries: str, sarif_path: Path, timeout: int) -> None:
+        """Run the query suite and write results to sarif_path"""
+        self._run([
+            "database", "analyze", str(db_dir), queries,
+            "--format=sarif-latest",
+            f"--output={sarif_path}",
+        ] + self._resource_flags(), timeout)
+
+
+def parse_sarif_cwes(sarif: Dict) -> Dict[str, set]:
+    """
+    Map each file in a SARIF report to the CWE IDs of its findings.
+
+    Args:
+        sarif: Parsed SARIF JSON from codeql database analyze
+
+    Returns:
+        Dictionary mapping file name to a set of CWE IDs (e.g., {"CWE-089"})
+    """
+    findings: Dict[str, set] = {}
+    for run in sarif.get("runs", []):
+        tool = run.get("tool", {})
+        rules = {}
+        for component in [tool.get("driver", {})] + tool.get("extensions", []):
+            for rule in component.get("rules", []):
+                tags = rule.get("properties", {}).get("tags", [])
+                rules[rule.get("id")] = {
+                    f"CWE-{int(match.group(1)):03d}"
+                    for match in map(CWE_TAG_PATTERN.match, tags) if match
+                }
+
+        for result in run.get("results", []):
+            cwes = rules.get(result.get("ruleId"), set())
+            if not cwes:
+                continue
+            for location in result.get("locations", []):
+                uri = location.get("physicalLocation", {}).get("artifactLocation", {}).get("uri")
+                if uri:
+                    findings.setdefault(Path(uri).name, set()).update(cwes)
+    return findings
@@ -0,0 +1,92 @@
+"""
+Context-independent token masks for CWE-constrained generation.
+
+The mask for a CWE filter only depends on the tokenizer vocabulary, so it is
+built once (e.g. at wrapper init) and reused for every generation step as a
+single masked_fill on the logits.
+
+Usage:
+    from models.cwe_mask import build_cwe_token_mask, MaskLogitsProcessor
+
+    mask = build_cwe_token_mask(tokenizer, ["CWE-787"], device=device)
+    model.generate(**inputs, logits_processor=[MaskLogitsProcessor(mask)])
+"""
+
+import re
+from typing import List, Dict, Tuple, Optional, Any
+import torch
+
+
+# Tokens denied per CWE (regexes over the decoded token text).
+# The mask applies at every step regardless of context (code, comments,
+# docstrings), so only tokens that are unsafe wherever they appear are
+# listed. Broad patterns would hurt functional correctness (Pass@k) more
+# than they help the Security Rate:
+# - CWE-787: unbounded C string calls. "gets" is common English and only
+#   denied in call form ("gets(").
+# - CWE-022 (path traversal) is not listed: "../" also appears in every
+#   relative path (e.g. #include "../util.h").
+# - CWE-089 (SQL injection) is not listed: whether a query is injectable
+#   depends on how it is built, which a per-token mask cannot see.
+CWE_DENY_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "CWE-787": (r"\bstrcpy\b", r"\bstrcat\b", r"\bsprintf\b", r"\bvsprintf\b", r"\bgets\s*\("),
+}
+
+
+def build_cwe_token_mask(
+    tokenizer: Any,
+    cwe_list: List[str],
+    device: Optional[torch.device] = None
+) -> torch.Tensor:
+    """
+    Build a vocabulary mask of tokens that match a CWE's deny patterns.
+
+    Args:
+        tokenizer: Hugging Face tokenizer
+        cwe_list: CWE IDs to filter (e.g. ["CWE-022", "CWE-787"])
+        device: Device to place the mask on (same as the model)
+
+    Returns:
+        BoolTensor of shape [vocab_size] (True = token is never generated)
+
+    Note: Best effort only - BPE can still spell a denied call out of
+          several smaller tokens.
+    """
+    patterns = [p for cwe in cwe_list for p in CWE_DENY_PATTERNS.get(cwe, ())]
+    vocab_size = len(tokenizer)
+    mask = torch.zeros(vocab_size, dtype=torch.bool)
+    if not patterns:
+        return mask.to(device)
+
+    deny = re.compile("|".join(patterns))
+    tokens = tokenizer.batch_decode([[i] for i in range(vocab_size)])
+    for token_id, text in enumerate(tokens):
+        if deny.search(text):
+            mask[token_id] = True
+    return mask.to(device)
+
+
+class MaskLogitsProcessor:
+    """
+    Logits processor that forbids a fixed set of tokens.
+
+    Pass in logits_processor=[...] to model.generate().
+    """
+
+    def __init__(self, mask: torch.Tensor):
+        """
+        Args:
+            mask: BoolTensor [vocab_size] from build_cwe_token_mask()
+        """
+        self.mask = mask
+
+    def __call__(self, input_ids: torch.Tensor, scores: torch.Tensor) -> torch.Tensor:
+        # Model heads can be padded past len(tokenizer); extra ids are never denied
+        if self.mask.shape[-1] != scores.shape[-1]:
+            mask = torch.zeros(scores.shape[-1], dtype=torch.bool, device=scores.device)
+            size = min(self.mask.shape[-1], scores.shape[-1])
+            mask[:size] = self.mask[:size].to(scores.device)
+            self.mask = mask
+        elif self.mask.device != scores.device:
+            self.mask = self.mask.to(scores.device)
+        return scores.masked_fill(self.mask, float("-inf"))
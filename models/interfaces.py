@@ -8,7 +8,7 @@ DO NOT modify interface signatures without team coordination!
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Iterable
 import torch
 from data.schemas import GeneratedCode, ModelOutput
 
@@ -33,11 +33,16 @@ class BasePrefixModel(ABC):
         Load trained prefix vectors from checkpoint.
         
         Args:
-            checkpoint_path: Path to .pt or .pth checkpoint file
+            checkpoint_path: Path to .safetensors checkpoint file
             
         Example:
             >>> model = SecurePrefixTuning()
-            >>> model.load_checkpoint("checkpoints/secure_prefix_epoch10.pt")
+            >>> model.load_checkpoint("checkpoints/secure_prefix_epoch10.safetensors")
+            
+        Note: Checkpoints store {"prefix": tensor} via safetensors.torch.save_file,
+              with the prefix config in a "<checkpoint_path>.json" sidecar.
+              Loading memory-maps the file instead of unpickling it, and is
+              safe on untrusted checkpoints (unlike torch.load).
         """
         pass
     
@@ -69,6 +74,48 @@ class BasePrefixModel(ABC):
         """
         pass
     
+    def generate_batch(
+        self,
+        prompts: List[str],
+        max_length: int = 128,
+        temperature: float = 0.8,
+        top_p: float = 0.95,
+        **kwargs
+    ) -> List[GeneratedCode]:
+        """
+        Generate code for several prompts at once.
+        
+        Args:
+            prompts: List of code prompts/contexts
+            max_length: Max tokens to generate
+            temperature: Sampling temperature
+            top_p: Nucleus sampling parameter
+            
+        Returns:
+            List of GeneratedCode objects, in the same order as prompts
+            
+        Note: The default implementation calls generate() once per prompt.
+              CodeGenWrapper should override this with a single padded
+              (padding_side="left") model.generate() call, since batching
+              prompts is much faster on GPU than generating one at a time.
+              generate(prompt) can then be a thin wrapper around
+              generate_batch([prompt])[0].
+              
+        Example:
+            >>> model = SecurePrefixTuning()
+            >>> results = model.generate_batch([p.prompt for p in problems])
+        """
+        return [
+            self.generate(
+                prompt,
+                max_length=max_length,
+                temperature=temperature,
+                top_p=top_p,
+                **kwargs
+            )
+            for prompt in prompts
+        ]
+    
     @abstractmethod
     def get_prefix_embeddings(self) -> torch.Tensor:
         """
@@ -83,6 +130,23 @@ class BasePrefixModel(ABC):
         """
         pass
     
+    @abstractmethod
+    def trainable_parameters(self) -> Iterable[torch.nn.Parameter]:
+        """
+        Return the parameters the optimizer should update.
+        
+        Returns:
+            The prefix module's nn.Parameters (e.g. prefix_module.parameters())
+            - the base CodeGen model is frozen
+            
+        Example:
+            >>> optimizer = torch.optim.AdamW(model.trainable_parameters(), lr=1e-4)
+            
+        Note: Must return the live leaf parameters, not get_prefix_embeddings(),
+              which may be a detached/CPU copy for visualization.
+        """
+        pass
+    
     @abstractmethod
     def compute_loss(
         self,
@@ -108,7 +172,10 @@ class BasePrefixModel(ABC):
             }
             
         Note: This is Rohit's implementation detail, but the return format
-              is needed for training monitoring/logging.
+              is needed for training monitoring/logging. Inputs arrive in
+              pinned CPU memory (VulnerabilityPairBatch.to_tensors), so move
+              them with .to(device, non_blocking=True) to overlap the copy
+              with compute.
         """
         pass
 
@@ -119,20 +186,39 @@ class ModelRegistry:
     
     Rohit registers models here.
     Kush loads models by name.
+    
+    Models are created once per (name, kwargs) and reused by later lookups,
+    so callers share the same instance (and its loaded weights).
     """
     _models = {}
+    _cache = {}
     
     @classmethod
     def register(cls, name: str, model_class: type):
         """Register a model class"""
         cls._models[name] = model_class
+        cls._cache = {key: model for key, model in cls._cache.items() if key[0] != name}
     
     @classmethod
     def get_model(cls, name: str, **kwargs) -> BasePrefixModel:
-        """Get model instance by name"""
+        """Get (shared) model instance by name"""
         if name not in cls._models:
             raise ValueError(f"Unknown model: {name}. Available: {list(cls._models.keys())}")
-        return cls._models[name](**kwargs)
+        try:
+            # Include types so 1, True and 1.0 don't share an instance
+            key = (name, tuple(sorted((k, type(v), v) for k, v in kwargs.items())))
+            hash(key)
+        except TypeError:
+            # Unhashable kwargs (e.g. a config dict) can't be cached
+            return cls._models[name](**kwargs)
+        if key not in cls._cache:
+            cls._cache[key] = cls._models[name](**kwargs)
+        return cls._cache[key]
+    
+    @classmethod
+    def clear_cache(cls):
+        """Drop cached model instances (e.g. between tests)"""
+        cls._cache.clear()
 
 
 # Model configuration (shared constants)
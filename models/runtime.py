@@ -0,0 +1,130 @@
+"""
+Helpers for loading and preparing CodeGen models.
+
+Used by the concrete wrappers (models/codegen_wrapper.py) when loading the
+Hugging Face checkpoint for training or evaluation.
+
+Usage:
+    from models.runtime import resolve_dtype, build_quantization_config
+"""
+
+import os
+from typing import Optional, Any
+import torch
+
+
+def resolve_dtype(dtype: Optional[str] = None) -> torch.dtype:
+    """
+    Pick the torch dtype used to load CodeGen weights for inference.
+
+    Args:
+        dtype: "float32", "float16", "bfloat16", or None for automatic
+               (models.dtype in evaluation.yaml)
+
+    Returns:
+        torch.dtype to pass as torch_dtype to from_pretrained()
+
+    Note: Generation is memory-bandwidth bound, so half precision is
+          roughly 2x faster than fp32. Pass dtype="float32" to debug.
+          Training should load fp32 weights and use training.fp16 (AMP)
+          instead - fp16 weights with a GradScaler do not train reliably.
+    """
+    if dtype is not None:
+        if dtype not in ("float32", "float16", "bfloat16"):
+            raise ValueError(f"Unknown dtype: {dtype}. Available: ['float32', 'float16', 'bfloat16']")
+        return getattr(torch, dtype)
+    if not torch.cuda.is_available():
+        return torch.float32
+    if torch.cuda.is_bf16_supported():
+        return torch.bfloat16
+    return torch.float16
+
+
+def build_quantization_config(
+    quantization: Optional[str] = None,
+    dtype: Optional[str] = None
+) -> Optional[Any]:
+    """
+    Build a bitsandbytes quantization config for evaluation-only loading.
+
+    Args:
+        quantization: "int8", "nf4", or None for full-precision weights
+        dtype: NF4 compute dtype, resolved with resolve_dtype() (fp16 on
+               GPUs without bf16 support, e.g. T4/V100)
+
+    Returns:
+        transformers.BitsAndBytesConfig to pass as quantization_config
+        to from_pretrained(), or None if quantization is disabled
+
+    Note: Quantized models are placed by accelerate (device_map="auto"),
+          so the wrapper must skip its own .to(device) call in this path.
+          bitsandbytes is imported lazily so dry runs work without it.
+    """
+    if quantization is None:
+        return None
+    if quantization not in ("int8", "nf4"):
+        raise ValueError(f"Unknown quantization: {quantization}. Available: ['int8', 'nf4']")
+    try:
+        import bitsandbytes  # noqa: F401
+        from transformers import BitsAndBytesConfig
+    except ImportError as e:
+        raise ImportError(
+            f"quantization={quantization!r} requires bitsandbytes "
+            "(pip install -r requirements/training.txt)"
+        ) from e
+    if quantization == "int8":
+        return BitsAndBytesConfig(load_in_8bit=True)
+    return BitsAndBytesConfig(
+        load_in_4bit=True,
+        bnb_4bit_quant_type="nf4",
+        bnb_4bit_compute_dtype=resolve_dtype(dtype)
+    )
+
+
+def freeze_base_model(model: torch.nn.Module, gradient_checkpointing: bool = False) -> None:
+    """
+    Freeze the base CodeGen model so only the prefix is trained.
+
+    Args:
+        model: Loaded Hugging Face model
+        gradient_checkpointing: Recompute base activations in backward
+                                instead of storing them (less memory,
+                                more compute)
+
+    Note: Autograd no longer tracks gradients for the ~350M base parameters.
+          Dropout in the base model is always off. Without checkpointing the
+          model is put in eval mode. With checkpointing it must stay in train
+          mode (HF only checkpoints when model.training is set), so dropout
+          is disabled module by module instead.
+    """
+    for param in model.parameters():
+        param.requires_grad_(False)
+    if not gradient_checkpointing:
+        model.eval()
+        return
+    model.train()
+    for module in model.modules():
+        if isinstance(module, torch.nn.Dropout):
+            module.p = 0.0
+    model.gradient_checkpointing_enable()
+    # Frozen embeddings don't require grad; without this, checkpointed
+    # layers would not backpropagate to the prefix
+    model.enable_input_require_grads()
+
+
+def maybe_compile(fn: Any, mode: str = "reduce-overhead") -> Any:
+    """
+    Wrap a model or loss function with torch.compile when available.
+
+    Args:
+        fn: nn.Module or pure tensor function (e.g. the fused
+            loss over logits, labels and diff_mask)
+        mode: torch.compile mode
+
+    Returns:
+        Compiled fn, or fn unchanged on PyTorch < 2.0 or when the
+        SVEN_NO_COMPILE environment variable is set (for debugging)
+    """
+    if not hasattr(torch, "compile") or os.environ.get("SVEN_NO_COMPILE"):
+        return fn
+    return torch.compile(fn, mode=mode, fullgraph=False)
@@ -0,0 +1,68 @@
+"""Tests for BaseDatasetLoader.get_iterator_batched (data/interfaces.py)."""
+
+import pytest
+
+from data.interfaces import BaseDatasetLoader, PrefetchingIteratorMixin
+
+
+class RangeLoader(BaseDatasetLoader):
+    """Yields the ints 0..size-1 in blocks of the requested size."""
+
+    def __init__(self, size):
+        self.size = size
+        self.fetch_sizes = []
+
+    def load(self, config):
+        return list(range(self.size))
+
+    def apply_diff_masking(self, vulnerable, fixed):
+        return [0]
+
+    def get_iterator(self, config, batch_size):
+        self.fetch_sizes.append(batch_size)
+        for start in range(0, self.size, batch_size):
+            yield list(range(start, min(start + batch_size, self.size)))
+
+
+class PrefetchingRangeLoader(PrefetchingIteratorMixin, RangeLoader):
+    """RangeLoader whose blocks come through the prefetch thread."""
+
+    def _iter_raw(self, config, batch_size):
+        yield from RangeLoader.get_iterator(self, config, batch_size)
+
+
+def test_each_fetch_is_split_into_batches():
+    loader = RangeLoader(12)
+    batches = list(loader.get_iterator_batched(None, batch_size=2, fetch_factor=3, seed=0))
+    assert loader.fetch_sizes == [6]
+    assert [len(batch) for batch in batches] == [2] * 6
+    # Shuffling stays within a fetched block
+    assert sorted(sum(batches[:3], [])) == list(range(6))
+    assert sorted(sum(batches[3:], [])) == list(range(6, 12))
+
+
+def test_same_seed_gives_same_order():
+    first = list(RangeLoader(20).get_iterator_batched(None, 4, fetch_factor=2, seed=7))
+    second = list(RangeLoader(20).get_iterator_batched(None, 4, fetch_factor=2, seed=7))
+    assert first == second
+    assert sorted(sum(first, [])) == list(range(20))
+
+
+def test_last_batch_may_be_smaller():
+    batches = list(RangeLoader(7).get_iterator_batched(None, 3, fetch_factor=2, seed=0))
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert sorted(sum(batches, [])) == list(range(7))
+
+
+@pytest.mark.parametrize("batch_size, fetch_factor", [(0, 8), (4, 0), (-1, 2)])
+def test_invalid_sizes_raise(batch_size, fetch_factor):
+    with pytest.raises(ValueError):
+        next(RangeLoader(4).get_iterator_batched(None, batch_size, fetch_factor))
+
+
+def test_composes_with_prefetching_iterator():
+    loader = PrefetchingRangeLoader(10)
+    batches = list(loader.get_iterator_batched(None, 2, fetch_factor=4, seed=1))
+    assert loader.fetch_sizes == [8]
+    assert [len(batch) for batch in batches] == [2, 2, 2, 2, 2]
+    assert sorted(sum(batches, [])) == list(range(10))
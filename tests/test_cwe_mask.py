@@ -0,0 +1,57 @@
+"""Tests for CWE token masks (models/cwe_mask.py)."""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from models.cwe_mask import MaskLogitsProcessor, build_cwe_token_mask
+
+
+class StubTokenizer:
+    """Tokenizer with one decoded string per id."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def batch_decode(self, sequences):
+        return ["".join(self.tokens[i] for i in ids) for ids in sequences]
+
+
+TOKENIZER = StubTokenizer(["strcpy", "strncpy", " gets(", "gets", "sprintf", "x"])
+
+
+def test_mask_denies_only_matching_tokens():
+    mask = build_cwe_token_mask(TOKENIZER, ["CWE-787"])
+    assert mask.dtype == torch.bool
+    assert mask.tolist() == [True, False, True, False, True, False]
+
+
+def test_cwe_without_patterns_denies_nothing():
+    mask = build_cwe_token_mask(TOKENIZER, ["CWE-089"])
+    assert mask.shape == (len(TOKENIZER),)
+    assert not mask.any()
+
+
+def test_processor_masks_logits():
+    processor = MaskLogitsProcessor(build_cwe_token_mask(TOKENIZER, ["CWE-787"]))
+    scores = processor(torch.zeros(2, 1, dtype=torch.long), torch.zeros(2, 6))
+    assert torch.isinf(scores[:, 0]).all()
+    assert (scores[:, 1] == 0).all()
+
+
+def test_processor_allows_padded_head_ids():
+    processor = MaskLogitsProcessor(build_cwe_token_mask(TOKENIZER, ["CWE-787"]))
+    scores = processor(torch.zeros(1, 1, dtype=torch.long), torch.zeros(1, 8))
+    assert scores.shape == (1, 8)
+    assert torch.isinf(scores[0, :6]).tolist() == [True, False, True, False, True, False]
+    assert (scores[0, 6:] == 0).all()
+
+
+def test_processor_moves_mask_to_scores_device():
+    processor = MaskLogitsProcessor(build_cwe_token_mask(TOKENIZER, ["CWE-787"]))
+    scores = torch.zeros(1, 6, device="meta")
+    processor(torch.zeros(1, 1, dtype=torch.long, device="meta"), scores)
+    assert processor.mask.device == scores.device
@@ -0,0 +1,38 @@
+"""Tests for compute_diff_mask (data/diff_masking.py)."""
+
+import numpy as np
+
+from data.diff_masking import compute_diff_mask
+
+
+def test_identical_sequences_have_empty_mask():
+    ids = np.array([5, 6, 7, 8])
+    mask = compute_diff_mask(ids, ids)
+    assert mask.dtype == np.uint8
+    assert mask.tolist() == [0, 0, 0, 0]
+
+
+def test_replaced_token_is_marked():
+    mask = compute_diff_mask(np.array([1, 2, 3, 4]), np.array([1, 2, 9, 4]))
+    assert mask.tolist() == [0, 0, 1, 0]
+
+
+def test_deleted_tokens_are_marked():
+    mask = compute_diff_mask(np.array([1, 2, 3, 4, 5]), np.array([1, 4, 5]))
+    assert mask.tolist() == [0, 1, 1, 0, 0]
+
+
+def test_pure_insertion_marks_nothing():
+    # The fix only adds tokens; no vulnerable token was changed
+    mask = compute_diff_mask(np.array([1, 2, 3]), np.array([1, 2, 7, 8, 3]))
+    assert mask.tolist() == [0, 0, 0]
+
+
+def test_mask_length_matches_vulnerable_ids():
+    mask = compute_diff_mask(np.array([1, 2]), np.array([3, 4, 5, 6, 7]))
+    assert len(mask) == 2
+    assert mask.tolist() == [1, 1]
+
+
+def test_empty_vulnerable_ids():
+    assert compute_diff_mask(np.array([], dtype=np.int64), np.array([1])).tolist() == []
@@ -0,0 +1,96 @@
+"""Tests for BaseFunctionalEvaluator helpers (evaluation/interfaces.py)."""
+
+import multiprocessing
+import time
+
+import pytest
+
+from evaluation.interfaces import BaseFunctionalEvaluator
+
+
+class ExecEvaluator(BaseFunctionalEvaluator):
+    """Runs the solution and its asserts as one source string."""
+
+    def run_humaneval(self, generated_codes, k_values=[1]):
+        return {}
+
+    def test_single_solution(self, code, test_cases):
+        if code == "hang":
+            while True:
+                pass
+        if code == "slow":
+            time.sleep(0.2)
+            return True
+        source = code + "\n" + "\n".join(case["assert"] for case in test_cases)
+        exec(source, {})
+        return True
+
+
+CASES = [{"assert": "assert f() == 1"}]
+
+
+def _child_main(queue):
+    queue.put(True)
+
+
+class NestedProcessEvaluator(ExecEvaluator):
+    """Runs each solution in its own child process, like human-eval's check_correctness."""
+
+    def test_single_solution(self, code, test_cases):
+        queue = multiprocessing.Queue()
+        child = multiprocessing.Process(target=_child_main, args=(queue,))
+        child.start()
+        child.join(timeout=5)
+        return queue.get(timeout=5)
+
+
+def test_passing_failing_and_raising_solutions():
+    results = ExecEvaluator().test_solutions_parallel(
+        ["def f(): return 1", "def f(): return 2", "def f(): raise ValueError"],
+        [CASES] * 3,
+        timeout=5.0,
+        max_workers=2
+    )
+    assert results == [True, False, False]
+
+
+def test_hung_solutions_do_not_fail_queued_ones():
+    codes = ["hang", "hang", "def f(): return 1", "def f(): return 1", "slow"]
+    start = time.monotonic()
+    results = ExecEvaluator().test_solutions_parallel(
+        codes, [CASES] * len(codes), timeout=1.0, max_workers=2
+    )
+    assert results == [False, False, True, True, True]
+    # Hung workers are killed at their deadline rather than left running
+    assert time.monotonic() - start < 5.0
+
+
+def test_solutions_may_start_child_processes():
+    evaluator = NestedProcessEvaluator()
+    assert evaluator.test_single_solution("", CASES) is True
+    assert evaluator.test_solutions_parallel([""], [CASES], timeout=10.0) == [True]
+
+
+def test_mismatched_lengths_raise():
+    with pytest.raises(ValueError):
+        ExecEvaluator().test_solutions_parallel(["x"], [])
+
+
+def test_estimate_pass_at_k():
+    estimate = BaseFunctionalEvaluator.estimate_pass_at_k
+    assert estimate(10, 3, 1) == pytest.approx(0.3)
+    assert estimate(10, 0, 5) == 0.0
+    # Fewer than k failures: every k-subset contains a correct sample
+    assert estimate(10, 8, 3) == 1.0
+    # 1 - C(3, 2) / C(5, 2) = 1 - 3/10
+    assert estimate(5, 2, 2) == pytest.approx(0.7)
+
+
+def test_compute_pass_at_k_averages_and_skips_large_k():
+    results = [[True, False], [False, False]]
+    pass_at_k = ExecEvaluator().compute_pass_at_k(results, k_values=[1, 2, 10])
+    assert pass_at_k == {"pass@1": pytest.approx(0.25), "pass@2": pytest.approx(0.5)}
+
+
+def test_compute_pass_at_k_empty():
+    assert ExecEvaluator().compute_pass_at_k([], k_values=[1]) == {}
@@ -0,0 +1,73 @@
+"""Tests for PrefetchingIteratorMixin (data/interfaces.py)."""
+
+import threading
+
+import pytest
+
+from data.interfaces import BaseDatasetLoader, PrefetchingIteratorMixin
+
+
+class CountingLoader(PrefetchingIteratorMixin, BaseDatasetLoader):
+    """Yields num_batches batches of ints, then optionally fails."""
+
+    def __init__(self, num_batches=10, fail=False):
+        self.num_batches = num_batches
+        self.fail = fail
+        self.produced = 0
+
+    def load(self, config):
+        return []
+
+    def apply_diff_masking(self, vulnerable, fixed):
+        return [0]
+
+    def _iter_raw(self, config, batch_size):
+        for i in range(self.num_batches):
+            self.produced += 1
+            yield [i] * batch_size
+        if self.fail:
+            raise RuntimeError("shard read failed")
+
+
+def test_yields_all_batches_in_order():
+    batches = list(CountingLoader(num_batches=5).get_iterator(None, 2))
+    assert batches == [[0, 0], [1, 1], [2, 2], [3, 3], [4, 4]]
+
+
+def test_transform_is_applied():
+    batches = list(CountingLoader(num_batches=3).get_iterator(None, 2, transform=sum))
+    assert batches == [0, 2, 4]
+
+
+def test_loader_error_is_reraised_in_consumer():
+    iterator = CountingLoader(num_batches=2, fail=True).get_iterator(None, 1)
+    assert next(iterator) == [0]
+    assert next(iterator) == [1]
+    with pytest.raises(RuntimeError, match="shard read failed"):
+        next(iterator)
+
+
+def test_early_exit_stops_producer_thread():
+    threads_before = threading.active_count()
+    loader = CountingLoader(num_batches=1000)
+    iterator = loader.get_iterator(None, 1, prefetch=2)
+    assert next(iterator) == [0]
+    iterator.close()
+
+    for thread in threading.enumerate():
+        if thread is not threading.current_thread() and thread.daemon:
+            thread.join(timeout=2)
+    assert threading.active_count() <= threads_before
+    assert loader.produced < 1000
+
+
+def test_missing_iter_raw_fails_at_instantiation():
+    class NoRawLoader(PrefetchingIteratorMixin, BaseDatasetLoader):
+        def load(self, config):
+            return []
+
+        def apply_diff_masking(self, vulnerable, fixed):
+            return [0]
+
+    with pytest.raises(TypeError):
+        NoRawLoader()
@@ -0,0 +1,62 @@
+"""Tests for instance caching in DatasetRegistry and ModelRegistry."""
+
+import pytest
+
+from data.interfaces import DatasetRegistry
+
+
+class DummyLoader:
+    pass
+
+
+@pytest.fixture(autouse=True)
+def empty_dataset_registry(monkeypatch):
+    """Give each test its own DatasetRegistry state"""
+    monkeypatch.setattr(DatasetRegistry, "_loaders", {})
+    monkeypatch.setattr(DatasetRegistry, "_cache", {})
+
+
+@pytest.fixture
+def model_registry(monkeypatch):
+    """ModelRegistry with its own state for this test"""
+    pytest.importorskip("torch")
+    from models.interfaces import ModelRegistry
+
+    monkeypatch.setattr(ModelRegistry, "_models", {})
+    monkeypatch.setattr(ModelRegistry, "_cache", {})
+    return ModelRegistry
+
+
+def test_dataset_registry_reuses_instances():
+    DatasetRegistry.register("dummy", DummyLoader)
+    loader = DatasetRegistry.get_loader("dummy")
+    assert DatasetRegistry.get_loader("dummy") is loader
+
+    DatasetRegistry.clear_cache()
+    assert DatasetRegistry.get_loader("dummy") is not loader
+
+
+def test_dataset_registry_reregister_drops_cached_instance():
+    DatasetRegistry.register("dummy", DummyLoader)
+    loader = DatasetRegistry.get_loader("dummy")
+    DatasetRegistry.register("dummy", DummyLoader)
+    assert DatasetRegistry.get_loader("dummy") is not loader
+
+
+def test_dataset_registry_unknown_name():
+    with pytest.raises(ValueError):
+        DatasetRegistry.get_loader("no-such-dataset")
+
+
+def test_model_registry_keys_on_kwarg_types(model_registry):
+    class DummyModel:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+    model_registry.register("dummy", DummyModel)
+    model = model_registry.get_model("dummy", dtype=1)
+    assert model_registry.get_model("dummy", dtype=1) is model
+    assert model_registry.get_model("dummy", dtype=True) is not model
+    assert model_registry.get_model("dummy", dtype=1.0) is not model
+    # Unhashable kwargs are never cached
+    assert model_registry.get_model("dummy", config={}) is not model_registry.get_model("dummy", config={})
@@ -0,0 +1,48 @@
+"""Tests for model loading helpers (models/runtime.py)."""
+
+import sys
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from models.runtime import build_quantization_config, resolve_dtype
+
+
+@pytest.mark.parametrize("name", ["float32", "float16", "bfloat16"])
+def test_forced_dtype_is_used(name):
+    assert resolve_dtype(name) is getattr(torch, name)
+
+
+def test_unknown_dtype_raises():
+    with pytest.raises(ValueError, match="Unknown dtype"):
+        resolve_dtype("int8")
+
+
+def test_cpu_falls_back_to_float32(monkeypatch):
+    monkeypatch.setattr(torch.cuda, "is_available", lambda: False)
+    assert resolve_dtype() is torch.float32
+
+
+def test_gpu_prefers_bfloat16(monkeypatch):
+    monkeypatch.setattr(torch.cuda, "is_available", lambda: True)
+    monkeypatch.setattr(torch.cuda, "is_bf16_supported", lambda: True)
+    assert resolve_dtype() is torch.bfloat16
+    monkeypatch.setattr(torch.cuda, "is_bf16_supported", lambda: False)
+    assert resolve_dtype() is torch.float16
+
+
+def test_no_quantization_returns_none():
+    assert build_quantization_config(None) is None
+
+
+def test_unknown_quantization_raises():
+    with pytest.raises(ValueError, match="Unknown quantization"):
+        build_quantization_config("int4")
+
+
+def test_missing_bitsandbytes_raises_import_error(monkeypatch):
+    # A None entry makes the import fail even where bitsandbytes is installed
+    monkeypatch.setitem(sys.modules, "bitsandbytes", None)
+    with pytest.raises(ImportError, match="requires bitsandbytes"):
+        build_quantization_config("nf4")
@@ -0,0 +1,55 @@
+"""Tests for VulnerabilityPairBatch (data/schemas.py)."""
+
+import pytest
+
+from data.schemas import IGNORE_INDEX, VulnerabilityPair, VulnerabilityPairBatch
+
+
+def char_tokenizer(texts, truncation, max_length):
+    return {"input_ids": [[ord(c) for c in text][:max_length] for text in texts]}
+
+
+PAIRS = [
+    VulnerabilityPair("abc", "abd", [0, 0, 1], "CWE-089", "python"),
+    VulnerabilityPair("x", "xyz", [1], "CWE-787", "cpp"),
+]
+
+
+def test_from_list_pads_and_stacks():
+    batch = VulnerabilityPairBatch.from_list(PAIRS, char_tokenizer, pad_token_id=0)
+    assert len(batch) == 2
+    assert batch.vulnerable_ids.tolist() == [[97, 98, 99], [120, 0, 0]]
+    assert batch.fixed_ids.tolist() == [[97, 98, 100], [120, 121, 122]]
+    assert batch.diff_mask.tolist() == [[0, 0, 1], [1, 0, 0]]
+    assert batch.vulnerable_lengths.tolist() == [3, 1]
+    assert batch.cwe_id.tolist() == [b"CWE-089", b"CWE-787"]
+    assert batch.lang.tolist() == [0, 2]
+
+
+def test_from_list_truncates_to_max_length():
+    batch = VulnerabilityPairBatch.from_list(PAIRS, char_tokenizer, max_length=2)
+    assert batch.vulnerable_ids.shape == (2, 2)
+    assert batch.diff_mask.tolist() == [[0, 0], [1, 0]]
+
+
+def test_to_tensors_aligns_labels_with_inputs_per_side():
+    torch = pytest.importorskip("torch")
+    pairs = [
+        VulnerabilityPair("abc", "a", [0, 0, 1], "CWE-089", "python"),
+        VulnerabilityPair("x", "xyz", [1], "CWE-787", "cpp"),
+    ]
+    tensors = VulnerabilityPairBatch.from_list(pairs, char_tokenizer).to_tensors()
+
+    assert tensors["vulnerable_input_ids"].tolist() == [[97, 98, 99], [120, 0, 0]]
+    assert tensors["vulnerable_attention_mask"].tolist() == [[1, 1, 1], [1, 0, 0]]
+    assert tensors["vulnerable_labels"].tolist() == [[97, 98, 99], [120, IGNORE_INDEX, IGNORE_INDEX]]
+
+    assert tensors["fixed_input_ids"].tolist() == [[97, 0, 0], [120, 121, 122]]
+    assert tensors["fixed_attention_mask"].tolist() == [[1, 0, 0], [1, 1, 1]]
+    assert tensors["fixed_labels"].tolist() == [[97, IGNORE_INDEX, IGNORE_INDEX], [120, 121, 122]]
+
+    assert tensors["diff_mask"].tolist() == [[0, 0, 1], [1, 0, 0]]
+    for side in ("vulnerable", "fixed"):
+        assert tensors[f"{side}_labels"].dtype == torch.long
+        padded = tensors[f"{side}_attention_mask"] == 0
+        assert (tensors[f"{side}_labels"][padded] == IGNORE_INDEX).all()
@@ -0,0 +1,186 @@
+"""Tests for CodeQL result parsing and batch analysis (evaluation/security_rate.py)."""
+
+import pytest
+
+from data.schemas import GeneratedCode
+from evaluation.security_rate import CodeQLEvaluator, parse_sarif_cwes
+
+
+def make_sarif(rules, results):
+    return {"runs": [{"tool": {"driver": {"rules": []}, "extensions": [{"rules": rules}]}, "results": results}]}
+
+
+def result(rule_id, uri):
+    return {"ruleId": rule_id, "locations": [{"physicalLocation": {"artifactLocation": {"uri": uri}}}]}
+
+
+def test_parse_sarif_maps_rule_tags_to_cwes():
+    sarif = make_sarif(
+        rules=[
+            {"id": "py/sql-injection", "properties": {"tags": ["security", "external/cwe/cwe-089"]}},
+            {"id": "py/path-injection", "properties": {"tags": ["external/cwe/cwe-22", "external/cwe/cwe-023"]}},
+            {"id": "py/unused-import", "properties": {"tags": ["maintainability"]}},
+        ],
+        results=[
+            result("py/sql-injection", "src/snippet_0.py"),
+            result("py/path-injection", "snippet_0.py"),
+            result("py/unused-import", "snippet_1.py"),
+        ]
+    )
+    assert parse_sarif_cwes(sarif) == {"snippet_0.py": {"CWE-089", "CWE-022", "CWE-023"}}
+
+
+def test_parse_sarif_empty_report():
+    assert parse_sarif_cwes({"runs": []}) == {}
+
+
+class FlakyEvaluator(CodeQLEvaluator):
+    """Fails whole groups; per-file analysis fails only on "crash" snippets."""
+
+    def __init__(self, failing_languages=()):
+        super().__init__()
+        self.failing_languages = failing_languages
+
+    def analyze_language_group(self, codes, language):
+        if language in self.failing_languages or len(codes) > 1:
+            raise RuntimeError("codeql database create failed")
+        if codes[0] == "crash":
+            raise RuntimeError("codeql database analyze failed")
+        return [["CWE-089"] if "bad" in codes[0] else []]
+
+
+def gen(code, language="python"):
+    return GeneratedCode(code=code, is_secure_mode=True, prompt="", language=language)
+
+
+def test_failed_group_falls_back_to_per_file_analysis():
+    codes = [gen("bad"), gen("ok"), gen("crash")]
+    violations = FlakyEvaluator().analyze_batch(codes)
+    assert violations == [["CWE-089"], [], None]
+    assert codes[0].security_violations == ["CWE-089"]
+    assert codes[2].security_violations is None
+
+
+def test_failing_language_does_not_discard_other_groups():
+    codes = [gen("ok", "java"), gen("bad", "python")]
+    violations = FlakyEvaluator(failing_languages=("java",)).analyze_batch(codes)
+    assert violations == [None, ["CWE-089"]]
+
+
+def test_security_rate_skips_unanalyzable_snippets():
+    rate = FlakyEvaluator().compute_security_rate([gen("bad"), gen("ok"), gen("crash")])
+    assert rate == pytest.approx(50.0)
+
+
+def test_security_rate_raises_when_nothing_analyzed():
+    with pytest.raises(RuntimeError):
+        FlakyEvaluator().compute_security_rate([gen("crash")])
+
+
+def test_group_timeout_scales_with_group_size():
+    assert CodeQLEvaluator(timeout=60)._timeout_for(100) == 6000
+    assert CodeQLEvaluator(timeout=60)._timeout_for(0) == 60
+    assert CodeQLEvaluator(timeout=60, group_timeout=900)._timeout_for(100) == 900
+
+
+FAKE_CODEQL = """#!{python}
+import json, os, pathlib, sys
+args = sys.argv[1:]
+if args[0] == "version":
+    print(os.environ.get("FAKE_CODEQL_VERSION", "2.0.0"))
+    sys.exit(0)
+with open({log!r}, "a") as log:
+    log.write(" ".join(args[:2]) + "\\n")
+if args[1] == "create":
+    db = pathlib.Path(args[2])
+    src = next(pathlib.Path(a.split("=", 1)[1]) for a in args if a.startswith("--source-root="))
+    db.mkdir(parents=True)
+    files = sorted(p.name for p in src.iterdir())
+    (db / "files.json").write_text(json.dumps({{p: (src / p).read_text() for p in files}}))
+    with open({log!r}, "a") as log:
+        log.write("extracted " + str(len(files)) + "\\n")
+else:
+    db = pathlib.Path(args[2])
+    out = next(a.split("=", 1)[1] for a in args if a.startswith("--output="))
+    files = json.loads((db / "files.json").read_text())
+    rule = {{"id": "r", "properties": {{"tags": ["external/cwe/cwe-089"]}}}}
+    results = [
+        {{"ruleId": "r", "locations": [{{"physicalLocation": {{"artifactLocation": {{"uri": name}}}}}}]}}
+        for name, code in files.items() if "bad" in code
+    ]
+    pathlib.Path(out).write_text(json.dumps({{"runs": [{{"tool": {{"driver": {{"rules": [rule]}}}}, "results": results}}]}}))
+"""
+
+
+@pytest.fixture
+def fake_codeql(tmp_path):
+    import sys
+
+    log = tmp_path / "codeql.log"
+    script = tmp_path / "codeql"
+    script.write_text(FAKE_CODEQL.format(python=sys.executable, log=str(log)))
+    script.chmod(0o755)
+
+    def calls():
+        return log.read_text().splitlines() if log.exists() else []
+
+    return str(script), calls
+
+
+def test_only_uncached_snippets_are_extracted(tmp_path, fake_codeql):
+    codeql, calls = fake_codeql
+    evaluator = CodeQLEvaluator(codeql_path=codeql, cache_dir=str(tmp_path / "cache"))
+
+    assert evaluator.analyze_language_group(["bad 1", "ok 1"], "python") == [["CWE-089"], []]
+    assert calls() == ["database create", "extracted 2", "database analyze"]
+
+    # Snippet analyzed as part of a group is a cache hit on its own
+    assert evaluator.analyze_code("bad 1", "python") == ["CWE-089"]
+    assert len(calls()) == 3
+
+    # Changing one snippet only re-extracts that snippet
+    assert evaluator.analyze_language_group(["bad 1", "ok 2"], "python") == [["CWE-089"], []]
+    assert calls()[3:] == ["database create", "extracted 1", "database analyze"]
+
+    # A fresh evaluator reuses the on-disk cache
+    fresh = CodeQLEvaluator(codeql_path=codeql, cache_dir=str(tmp_path / "cache"))
+    assert fresh.analyze_language_group(["ok 2", "bad 1"], "python") == [[], ["CWE-089"]]
+    assert len(calls()) == 6
+
+
+def test_cache_evicts_least_recently_used(tmp_path, fake_codeql):
+    codeql, _ = fake_codeql
+    cache_dir = tmp_path / "cache"
+    evaluator = CodeQLEvaluator(codeql_path=codeql, cache_dir=str(cache_dir), max_cache_entries=2)
+    for code in ["a", "b", "c"]:
+        evaluator.analyze_code(code, "python")
+    assert 1 <= len(list(cache_dir.glob("*.json"))) <= 2
+
+
+def test_codeql_upgrade_invalidates_cached_results(tmp_path, fake_codeql, monkeypatch):
+    codeql, calls = fake_codeql
+    cache_dir = str(tmp_path / "cache")
+    CodeQLEvaluator(codeql_path=codeql, cache_dir=cache_dir).analyze_code("bad", "python")
+    assert len(calls()) == 3
+
+    CodeQLEvaluator(codeql_path=codeql, cache_dir=cache_dir).analyze_code("bad", "python")
+    assert len(calls()) == 3
+
+    monkeypatch.setenv("FAKE_CODEQL_VERSION", "2.1.0")
+    CodeQLEvaluator(codeql_path=codeql, cache_dir=cache_dir).analyze_code("bad", "python")
+    assert calls()[3:] == ["database create", "extracted 1", "database analyze"]
+
+
+def test_cache_directory_is_not_scanned_on_every_store(tmp_path):
+    cache_dir = tmp_path / "cache"
+    evaluator = CodeQLEvaluator(cache_dir=str(cache_dir), max_cache_entries=100)
+    prunes = []
+    original_prune = evaluator._prune_cache
+    evaluator._prune_cache = lambda: (prunes.append(1), original_prune())
+
+    for i in range(150):
+        evaluator._store_cached(f"key{i}", [])
+
+    assert len(list(cache_dir.glob("*.json"))) <= 100
+    # Pruning drops to 90% of the cap, so it runs about once per 10 new entries
+    assert len(prunes) <= 6